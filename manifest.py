@@ -0,0 +1,4 @@
+# Freeze the controller into a custom MicroPython build:
+#   make -C ports/rp2 BOARD=RPI_PICO_W FROZEN_MANIFEST=/path/to/manifest.py
+include("$(BOARD_DIR)/manifest.py")
+module("moth_lights.py", opt=3)
@@ -0,0 +1,323 @@
+import time
+import network
+import ntptime
+from machine import Pin, lightsleep, mem32
+
+# Bound once so hot paths skip the module attribute lookup
+_time = time.time
+_localtime = time.localtime
+_mktime = time.mktime
+
+# ==============================
+# WIFI + TIME (NTP)
+# ==============================
+
+WIFI_SSID = "TheHive"
+WIFI_PASSWORD = "H0N3YB33"
+
+def wifi_connect(timeout_s=20):
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    if not wlan.isconnected():
+        wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+        t0 = time.time()
+        while not wlan.isconnected() and (time.time() - t0) < timeout_s:
+            time.sleep(0.5)
+    return wlan.isconnected()
+
+def _nth_sunday(n, wday_first):
+    """
+    Day-of-month of the nth Sunday, given wday of the 1st (Mon=0..Sun=6).
+    """
+    first_sunday = 1 + ((6 - wday_first) % 7)
+    return first_sunday + (n - 1) * 7
+
+def _weekday(y, m, d):
+    """
+    Zeller's congruence, returned as Mon=0..Sun=6. Doesn't depend on the
+    port's time.localtime() wday convention.
+    """
+    if m < 3:
+        y -= 1
+        m += 12
+    K = y % 100
+    J = y // 100
+    h = (d + (13 * (m + 1)) // 5 + K + K // 4 + J // 4 + 5 * J) % 7  # 0=Saturday
+    return (h + 5) % 7
+
+def _dst_days(year):
+    """
+    (start_day, end_day): 2nd Sunday in March and 1st Sunday in November.
+    """
+    return (_nth_sunday(2, _weekday(year, 3, 1)),
+            _nth_sunday(1, _weekday(year, 11, 1)))
+
+def _dst_start_utc(year, start_day):
+    # DST starts at 2:00 EST = 07:00 UTC
+    return _mktime((year, 3, start_day, 7, 0, 0, 0, 0))
+
+# Detroit UTC offset (EST -5 / EDT -4) only changes at the two US DST
+# transitions (post-2007 rules), so cache it until the next one.
+_cached_offset_h = -5
+_next_dst_transition_utc = 0
+
+def _recompute_offset(t):
+    """
+    ntptime sets RTC to UTC. Set the Detroit offset for UTC second t and the
+    UTC second at which it next changes.
+    """
+    global _cached_offset_h, _next_dst_transition_utc
+    year = _localtime(t)[0]
+    start_day, end_day = _dst_days(year)
+    start = _dst_start_utc(year, start_day)
+    # DST ends at 2:00 EDT = 06:00 UTC
+    end = _mktime((year, 11, end_day, 6, 0, 0, 0, 0))
+    if t < start:
+        _cached_offset_h = -5
+        _next_dst_transition_utc = start
+    elif t < end:
+        _cached_offset_h = -4
+        _next_dst_transition_utc = end
+    else:
+        _cached_offset_h = -5
+        _next_dst_transition_utc = _dst_start_utc(year + 1, _dst_days(year + 1)[0])
+
+def sync_time_ntp():
+    """
+    Sets Pico RTC to UTC via NTP. Returns True/False.
+    """
+    try:
+        ntptime.settime()
+        return True
+    except Exception as e:
+        print("NTP sync failed:", e)
+        return False
+
+# RTC drift between NTP syncs, measured at each resync and applied linearly
+MAX_DRIFT_PPM = 500  # anything larger is a clock jump, not drift
+MIN_DRIFT_WINDOW_S = 6 * 60 * 60  # shorter gaps are too short to measure drift
+_last_sync_utc = None
+_drift_ppm = 0
+
+def now_utc():
+    """
+    RTC seconds (UTC) corrected by the drift measured at the last two syncs.
+    """
+    t = _time()
+    if _drift_ppm:
+        t += (t - _last_sync_utc) * _drift_ppm // 1000000
+    return t
+
+def resync_time():
+    """
+    Re-sync the RTC over NTP and update the drift estimate. On Wi-Fi or NTP
+    failure the RTC is left as-is and False is returned.
+    """
+    global _last_sync_utc, _drift_ppm, _next_rollover_secs, _next_dst_transition_utc
+    if not wifi_connect():
+        return False
+    rtc_before = _time()
+    if not sync_time_ntp():
+        return False
+    t = _time()
+    if _last_sync_utc is not None and t - _last_sync_utc >= MIN_DRIFT_WINDOW_S:
+        ppm = (t - rtc_before) * 1000000 // (t - _last_sync_utc)
+        if -MAX_DRIFT_PPM <= ppm <= MAX_DRIFT_PPM:
+            _drift_ppm = ppm
+        # otherwise keep the previous estimate
+    _last_sync_utc = t
+    # The clock may have stepped; recompute cached day/offset boundaries
+    _next_rollover_secs = 0
+    _next_dst_transition_utc = 0
+    return True
+
+def localtime_detroit():
+    """
+    Return Detroit-local time tuple using UTC RTC + computed offset.
+    """
+    t = now_utc()  # RTC is UTC after ntptime.settime()
+    if t >= _next_dst_transition_utc:
+        _recompute_offset(t)
+    return _localtime(t + _cached_offset_h * 3600)
+
+
+# ==============================
+# CONFIG
+# ==============================
+
+# Set True to log day transitions and boot status over serial
+DEBUG = False
+
+CYCLE_LENGTH_DAYS = 24
+
+# Day offset per cage, indexed by cage_idx (0..3 = cages 1..4)
+CAGE_OFFSETS = (0, 6, 12, 18)
+NUM_CAGES = 4
+
+# ====== CYCLE ANCHOR ======
+# Today (Detroit local date) should be Cage #1 Day 5 (GREEN)
+REFERENCE_YEAR  = 2025
+REFERENCE_MONTH = 12
+REFERENCE_DAY   = 16
+REFERENCE_GLOBAL_DAY = 4  # Day 5 (1-based) => 4 (0-based)
+
+# ==============================
+# PIN MAP
+# ==============================
+
+# GPIO numbers per cage_idx, in color-code order (R, Y, G)
+CAGE_PIN_NUMS = (
+    (2, 3, 4),      # cage 1
+    (5, 6, 7),      # cage 2
+    (28, 27, 26),   # cage 3
+    (21, 20, 19),   # cage 4
+)
+
+# Never indexed: constructing the Pins puts every LED GPIO in SIO output
+# mode, which the mem32 set/clear writes below depend on. LEDs are active-high.
+CAGE_PINS = tuple(tuple(Pin(n, Pin.OUT) for n in nums) for nums in CAGE_PIN_NUMS)
+
+# Integer color codes, used everywhere past boot instead of color strings
+COLOR_NAMES = ("red", "yellow", "green")  # code -> name
+
+# RP2040 SIO registers: writing a bitmask sets/clears those GPIOs in one store
+SIO_GPIO_OUT_SET = 0xD0000014
+SIO_GPIO_OUT_CLR = 0xD0000018
+
+# ON_MASK[cage_idx][code] -> one LED bit; CAGE_MASK[cage_idx] -> all three LED bits
+ON_MASK = tuple(tuple(1 << n for n in nums) for nums in CAGE_PIN_NUMS)
+CAGE_MASK = tuple(m[0] | m[1] | m[2] for m in ON_MASK)
+
+# ==============================
+# HELPERS
+# ==============================
+
+# Color code per cage day: days 0-5 green, 6-19 yellow, 20-23 red
+_COLOR_LUT = b"\x02\x02\x02\x02\x02\x02\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x00\x00\x00\x00"
+
+def color_for_cage_day(cage_day):
+    return _COLOR_LUT[cage_day]
+
+def _rata_die(y, m, d):
+    """
+    Day number of a proleptic Gregorian date, integer ops only.
+    Months are shifted so the year starts in March (leap day falls last).
+    """
+    if m < 3:
+        y -= 1
+        m += 12
+    return 365 * y + y // 4 - y // 100 + y // 400 + (153 * (m - 3) + 2) // 5 + d
+
+REF_EPOCH_DAYS = _rata_die(REFERENCE_YEAR, REFERENCE_MONTH, REFERENCE_DAY)
+
+# Global day only changes at Detroit midnight; cache it until then.
+_next_rollover_secs = 0
+_cached_gday = None
+
+def current_global_day():
+    global _next_rollover_secs, _cached_gday
+    t = now_utc()
+    if t < _next_rollover_secs:
+        return _cached_gday
+
+    now = localtime_detroit()  # (year, month, mday, hour, min, sec, wday, yday)
+    d = _rata_die(now[0], now[1], now[2]) - REF_EPOCH_DAYS  # days since reference
+    _cached_gday = (REFERENCE_GLOBAL_DAY + d) % CYCLE_LENGTH_DAYS
+
+    # Next local midnight at today's offset. If a DST transition comes first,
+    # midnight moves by the offset change (an hour earlier in spring, later in fall).
+    secs_today = now[3] * 3600 + now[4] * 60 + now[5]
+    rollover = t + (24 * 60 * 60 - secs_today)
+    if rollover > _next_dst_transition_utc:
+        new_offset_h = -4 if _cached_offset_h == -5 else -5
+        rollover -= (new_offset_h - _cached_offset_h) * 3600
+    _next_rollover_secs = rollover
+    return _cached_gday
+
+# Color schedule is static, so build it once at boot:
+# COLOR_TABLE[global_day][cage_idx] -> color code
+COLOR_TABLE = tuple(
+    tuple(color_for_cage_day((g - off) % CYCLE_LENGTH_DAYS) for off in CAGE_OFFSETS)
+    for g in range(CYCLE_LENGTH_DAYS)
+)
+
+# All 12 LEDs share one SIO bank, so a whole day's pattern is a single mask.
+ALL_LED_MASK = CAGE_MASK[0] | CAGE_MASK[1] | CAGE_MASK[2] | CAGE_MASK[3]
+FULL_STATE_MASK = tuple(
+    ON_MASK[0][row[0]] | ON_MASK[1][row[1]] | ON_MASK[2][row[2]] | ON_MASK[3][row[3]]
+    for row in COLOR_TABLE
+)
+# LEDs to switch off for each day; LEDs that stay lit are never touched
+OFF_STATE_MASK = tuple(ALL_LED_MASK & ~on for on in FULL_STATE_MASK)
+
+# Seconds before the rollover at which the daily NTP resync runs
+RESYNC_LEAD_S = 60
+
+# rp2 lightsleep() takes its delay as a 32-bit microsecond count, so sleep in
+# chunks well below that limit.
+MAX_SLEEP_S = 60 * 60
+
+def sleep_until(target_secs):
+    """
+    Light-sleep until now_utc() reaches target_secs. GPIO outputs hold their state.
+    """
+    while True:
+        remaining = target_secs - now_utc()
+        if remaining <= 0:
+            return
+        lightsleep(min(remaining, MAX_SLEEP_S) * 1000)
+
+def update_lights_for_global_day(global_day):
+    mem32[SIO_GPIO_OUT_CLR] = OFF_STATE_MASK[global_day]
+    mem32[SIO_GPIO_OUT_SET] = FULL_STATE_MASK[global_day]
+    if DEBUG:
+        colors = COLOR_TABLE[global_day]
+        print("Using global_day:", global_day)
+        for i in range(NUM_CAGES):
+            print("Cage", i + 1, "color:", COLOR_NAMES[colors[i]])
+
+# ==============================
+# BOOT + MAIN LOOP
+# ==============================
+
+def main():
+    ok_wifi = wifi_connect()
+
+    ok_ntp = False
+    if ok_wifi:
+        ok_ntp = resync_time()
+
+    if DEBUG:
+        print("Wi-Fi connected:", ok_wifi)
+        print("NTP synced:", ok_ntp)
+        print("UTC RTC:", time.localtime())
+        print("Detroit local:", localtime_detroit())
+
+    mem32[SIO_GPIO_OUT_CLR] = ALL_LED_MASK
+
+    last_global_day = None
+    resynced_gday = None
+
+    while True:
+        try:
+            gday = current_global_day()
+            if gday != last_global_day:
+                if DEBUG:
+                    print("=== NEW LOGICAL DAY:", gday, "===")
+                update_lights_for_global_day(gday)
+                last_global_day = gday
+
+            # Once per day, resync shortly *before* the rollover so a clock step
+            # can't move us back across midnight, then re-check the day.
+            if resynced_gday != gday and _next_rollover_secs - now_utc() > RESYNC_LEAD_S:
+                sleep_until(_next_rollover_secs - RESYNC_LEAD_S)
+                resync_time()
+                resynced_gday = gday
+                continue
+
+            # Nothing changes until the next local midnight; wake just after it.
+            sleep_until(_next_rollover_secs + 5)
+
+        except Exception as e:
+            print("Error in main loop:", e)
+            time.sleep(5)